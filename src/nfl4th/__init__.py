@@ -1,5 +1,5 @@
 """NFL 4th down decision model package."""
 
-from .model import evaluate, load_lookups
+from .model import attach_lookups, evaluate, load_lookups, publish_lookups
 
-__all__ = ["evaluate", "load_lookups"]
+__all__ = ["attach_lookups", "evaluate", "load_lookups", "publish_lookups"]
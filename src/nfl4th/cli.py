@@ -1,10 +1,15 @@
 import argparse
 import csv
+import hashlib
 import json
+import sys
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Tuple, TypedDict
+from typing import Dict, Iterator, List, Optional, Tuple, TypedDict
 
-from .model import evaluate, load_lookups
+from .grade import DECISIONS, DecisionGrader, format_grade_report
+from .model import evaluate, load_lookups, lookups_hash, use_lookups
 
 
 def yard_line_type(value: str) -> int:
@@ -62,7 +67,44 @@ def choose_override(row_value: Optional[float], global_value: Optional[float]) -
     return row_value if row_value is not None else global_value
 
 
-def load_batch_cases(path: Path, fmt: str) -> List[BatchCase]:
+def _load_json_items(path: Path) -> list:
+    with path.open() as fh:
+        data = json.load(fh)
+    if not isinstance(data, list):
+        raise ValueError("JSON input must be a list of {yard_line, yards_to_go}")
+    return data
+
+
+def _json_cases(data: list, start: int = 0, stop: Optional[int] = None) -> List[BatchCase]:
+    rows: List[BatchCase] = []
+    for idx, item in enumerate(islice(data, start, stop), start=start):
+        if not isinstance(item, dict):
+            raise ValueError(f"JSON entry {idx} is not an object")
+        if "yard_line" not in item or "yards_to_go" not in item:
+            raise ValueError(f"JSON entry {idx} missing required keys")
+        rows.append(
+            BatchCase(
+                yard_line=yard_line_type(str(item["yard_line"])),
+                yards_to_go=yards_to_go_type(str(item["yards_to_go"])),
+                p_convert=parse_optional_prob(item.get("p_convert"), "p_convert"),
+                p_fg=parse_optional_prob(item.get("p_fg"), "p_fg"),
+                punt_net=parse_optional_punt(item.get("punt_net")),
+            )
+        )
+    return rows
+
+
+def count_csv_rows(path: Path) -> int:
+    with path.open(newline="") as fh:
+        reader = csv.reader(fh)
+        next(reader, None)
+        # csv.DictReader skips blank lines, so they must not count as rows either
+        return sum(1 for row in reader if row)
+
+
+def load_batch_cases(
+    path: Path, fmt: str, start: int = 0, stop: Optional[int] = None
+) -> List[BatchCase]:
     if fmt == "csv":
         with path.open(newline="") as fh:
             reader = csv.DictReader(fh)
@@ -70,7 +112,7 @@ def load_batch_cases(path: Path, fmt: str) -> List[BatchCase]:
             if missing:
                 raise ValueError(f"CSV missing columns: {', '.join(sorted(missing))}")
             rows: List[BatchCase] = []
-            for row in reader:
+            for row in islice(reader, start, stop):
                 yard_line = yard_line_type(row["yard_line"])
                 yards = yards_to_go_type(row["yards_to_go"])
                 rows.append(
@@ -83,28 +125,430 @@ def load_batch_cases(path: Path, fmt: str) -> List[BatchCase]:
                     )
                 )
             return rows
-    with path.open() as fh:
-        data = json.load(fh)
-    if not isinstance(data, list):
-        raise ValueError("JSON input must be a list of {yard_line, yards_to_go}")
-    rows: List[BatchCase] = []
-    for idx, item in enumerate(data):
-        if not isinstance(item, dict):
-            raise ValueError(f"JSON entry {idx} is not an object")
-        if "yard_line" not in item or "yards_to_go" not in item:
-            raise ValueError(f"JSON entry {idx} missing required keys")
+    return _json_cases(_load_json_items(path), start, stop)
+
+
+def load_batch_shard(
+    path: Path, fmt: str, index: int, count: int
+) -> Tuple[List[BatchCase], int, int]:
+    """Parse only shard ``index`` of ``count``; returns (cases, start row, total rows).
+
+    CSV rows outside the shard are counted but never parsed or kept. JSON has no
+    streaming parser in the standard library, so the document is still loaded whole,
+    but only the shard's entries are validated and turned into cases.
+    """
+    if fmt == "csv":
+        total_rows = count_csv_rows(path)
+        start, stop = shard_bounds(total_rows, index, count)
+        return load_batch_cases(path, fmt, start, stop), start, total_rows
+    data = _load_json_items(path)
+    start, stop = shard_bounds(len(data), index, count)
+    return _json_cases(data, start, stop), start, len(data)
+
+
+class GradedPlay(TypedDict):
+    row: int
+    yard_line: int
+    yards_to_go: float
+    decision: str
+    p_convert: Optional[float]
+    p_fg: Optional[float]
+    punt_net: Optional[float]
+    team: Optional[str]
+    coach: Optional[str]
+    season: Optional[str]
+    week: Optional[str]
+
+
+def iter_graded_plays(path: Path) -> Iterator[GradedPlay]:
+    with path.open(newline="") as fh:
+        reader = csv.DictReader(fh)
+        missing = {"yard_line", "yards_to_go", "decision"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV missing columns: {', '.join(sorted(missing))}")
+        for line, row in enumerate(reader, start=2):
+            try:
+                decision = (row["decision"] or "").strip().lower()
+                if decision not in DECISIONS:
+                    raise ValueError(f"decision must be one of {', '.join(DECISIONS)}")
+                yield GradedPlay(
+                    row=line,
+                    yard_line=yard_line_type(row["yard_line"]),
+                    yards_to_go=yards_to_go_type(row["yards_to_go"]),
+                    decision=decision,
+                    p_convert=parse_optional_prob(row.get("p_convert"), "p_convert"),
+                    p_fg=parse_optional_prob(row.get("p_fg"), "p_fg"),
+                    punt_net=parse_optional_punt(row.get("punt_net")),
+                    team=row.get("team") or None,
+                    coach=row.get("coach") or None,
+                    season=row.get("season") or None,
+                    week=row.get("week") or None,
+                )
+            except (ValueError, argparse.ArgumentTypeError) as exc:
+                raise ValueError(f"{path}: line {line}: {exc}") from exc
+
+
+def grade_plays(plays: Iterator[GradedPlay], top_n: int = 10) -> dict:
+    # Play-by-play repeats the same situations constantly, so memoise the model.
+    cached_evaluate = lru_cache(maxsize=65536)(evaluate)
+    grader = DecisionGrader(top_n=top_n)
+    for play in plays:
+        result = cached_evaluate(
+            play["yard_line"],
+            play["yards_to_go"],
+            override_p_convert=play["p_convert"],
+            override_p_fg=play["p_fg"],
+            override_punt_net=play["punt_net"],
+        )
+        grader.add(play, result)
+    return grader.report()
+
+
+def grade_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="nfl4th grade",
+        description="Grade actual 4th down decisions against the model over a play-by-play CSV",
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        required=True,
+        help="CSV with yard_line, yards_to_go, decision (go/fg/punt) and optional "
+        "team, coach, season, week, p_convert, p_fg, punt_net columns",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of worst decisions (by EV lost) to list (default: 10)",
+    )
+    parser.add_argument(
+        "--lookups",
+        type=Path,
+        help="Path to alternate lookups.json (defaults to built-in tables)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write the report to this path instead of stdout",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Allow overwriting existing --output file",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Emit the report as JSON instead of formatted text",
+    )
+    args = parser.parse_args(argv)
+    if args.top < 0:
+        parser.error("--top must be zero or positive")
+    if args.output and args.output.exists() and not args.force:
+        parser.error(f"{args.output} already exists. Use --force to overwrite.")
+    if args.lookups:
+        load_lookups(args.lookups)
+
+    try:
+        report = grade_plays(iter_graded_plays(args.input), top_n=args.top)
+    except ValueError as exc:
+        parser.error(str(exc))
+    text = json.dumps(report, indent=2) if args.json else format_grade_report(report)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Graded {report['overall']['plays']} plays; report written to {args.output}")
+    else:
+        print(text)
+
+
+def resolve_lookup_paths(paths: List[Path]) -> List[Path]:
+    resolved: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            found = sorted(path.glob("*.json"))
+            if not found:
+                raise ValueError(f"No lookup files (*.json) found in {path}")
+            resolved.extend(found)
+        else:
+            resolved.append(path)
+    return resolved
+
+
+def lookup_variant_names(paths: List[Path]) -> List[str]:
+    names = [path.stem for path in paths]
+    dupes = sorted({name for name in names if names.count(name) > 1})
+    if dupes:
+        raise ValueError(f"Lookup variant names must be unique: {', '.join(dupes)}")
+    return names
+
+
+def evaluate_cases(
+    cases: List[BatchCase],
+    p_convert: Optional[float] = None,
+    p_fg: Optional[float] = None,
+    punt_net: Optional[float] = None,
+) -> List[dict]:
+    return [
+        evaluate(
+            case["yard_line"],
+            case["yards_to_go"],
+            override_p_convert=choose_override(case["p_convert"], p_convert),
+            override_p_fg=choose_override(case["p_fg"], p_fg),
+            override_punt_net=choose_override(case["punt_net"], punt_net),
+        )
+        for case in cases
+    ]
+
+
+def evaluate_variants(
+    cases: List[BatchCase],
+    lookup_paths: List[Path],
+    p_convert: Optional[float] = None,
+    p_fg: Optional[float] = None,
+    punt_net: Optional[float] = None,
+) -> Dict[str, List[dict]]:
+    names = lookup_variant_names(lookup_paths)
+    by_variant: Dict[str, List[dict]] = {}
+    for name, path in zip(names, lookup_paths):
+        with use_lookups(path):
+            by_variant[name] = evaluate_cases(cases, p_convert, p_fg, punt_net)
+    return by_variant
+
+
+def compare_variants(by_variant: Dict[str, List[dict]]) -> List[dict]:
+    names = list(by_variant)
+    rows: List[dict] = []
+    for results in zip(*by_variant.values()):
+        variants = dict(zip(names, results))
         rows.append(
-            BatchCase(
-                yard_line=yard_line_type(str(item["yard_line"])),
-                yards_to_go=yards_to_go_type(str(item["yards_to_go"])),
-                p_convert=parse_optional_prob(item.get("p_convert"), "p_convert"),
-                p_fg=parse_optional_prob(item.get("p_fg"), "p_fg"),
-                punt_net=parse_optional_punt(item.get("punt_net")),
-            )
+            {
+                "yard_line": results[0]["yard_line"],
+                "yards_to_go": results[0]["yards_to_go"],
+                "variants": variants,
+                "disagreement": len({res["recommendation"] for res in results}) > 1,
+            }
         )
     return rows
 
 
+def variants_lookups_hash(lookup_paths: List[Path]) -> str:
+    digest = hashlib.sha256()
+    for name, path in zip(lookup_variant_names(lookup_paths), lookup_paths):
+        with use_lookups(path):
+            digest.update(f"{name}:{lookups_hash()}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+SHARD_COLUMNS = ["row_index", "shard", "total_rows", "lookups_hash"]
+
+
+class ShardInfo(TypedDict):
+    shard: str
+    start: int
+    total_rows: int
+    lookups_hash: str
+
+
+def shard_type(value: str) -> Tuple[int, int]:
+    try:
+        index_text, count_text = value.split("/")
+        index, count = int(index_text), int(count_text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("shard must look like i/N, e.g. 0/4") from exc
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError("shard must satisfy 0 <= i < N")
+    return index, count
+
+
+def shard_bounds(total_rows: int, index: int, count: int) -> Tuple[int, int]:
+    return index * total_rows // count, (index + 1) * total_rows // count
+
+
+def add_shard_fields(results: List[dict], info: ShardInfo) -> List[dict]:
+    return [
+        {
+            "row_index": info["start"] + offset,
+            "shard": info["shard"],
+            "total_rows": info["total_rows"],
+            "lookups_hash": info["lookups_hash"],
+            **res,
+        }
+        for offset, res in enumerate(results)
+    ]
+
+
+def add_shard_columns(table: str, info: ShardInfo, delimiter: str = ",") -> str:
+    lines = table.split("\n")
+    out = [delimiter.join(SHARD_COLUMNS + [lines[0]])]
+    if len(lines) == 1:
+        # An empty shard still records its metadata, in a row with no row_index,
+        # so merge can check its lookup hash and row count like any other shard.
+        blanks = [""] * len(lines[0].split(delimiter))
+        meta = ["", info["shard"], str(info["total_rows"]), info["lookups_hash"]]
+        out.append(delimiter.join(meta + blanks))
+    for offset, line in enumerate(lines[1:]):
+        meta = [
+            str(info["start"] + offset),
+            info["shard"],
+            str(info["total_rows"]),
+            info["lookups_hash"],
+        ]
+        out.append(delimiter.join(meta + [line]))
+    return "\n".join(out)
+
+
+def shard_json_document(results: List[dict], info: ShardInfo) -> dict:
+    return {
+        "shard": info["shard"],
+        "total_rows": info["total_rows"],
+        "lookups_hash": info["lookups_hash"],
+        "rows": add_shard_fields(results, info),
+    }
+
+
+def load_shard_rows(
+    path: Path, fmt: str
+) -> Tuple[Optional[List[str]], List[dict], Optional[dict]]:
+    """Read one shard output; returns (columns, rows, file-level metadata or None).
+
+    Columns are None for an empty JSON shard, which has no rows to take them from.
+    """
+    meta: Optional[dict] = None
+    header: Optional[List[str]]
+    if fmt == "json":
+        with path.open() as fh:
+            data = json.load(fh)
+        if not isinstance(data, dict) or not isinstance(data.get("rows"), list):
+            raise ValueError(f"{path}: not a shard output (expected an object with 'rows')")
+        missing = [key for key in ("shard", "total_rows", "lookups_hash") if key not in data]
+        if missing:
+            raise ValueError(f"{path}: shard output missing {', '.join(missing)}")
+        meta = {key: data[key] for key in ("shard", "total_rows", "lookups_hash")}
+        rows = data["rows"]
+        header = list(rows[0]) if rows and isinstance(rows[0], dict) else None
+    else:
+        delimiter = "\t" if fmt == "tsv" else ","
+        with path.open(newline="") as fh:
+            reader = csv.DictReader(fh, delimiter=delimiter)
+            header = list(reader.fieldnames or [])
+            rows = list(reader)
+        for offset, row in enumerate(rows):
+            # DictReader fills short rows with None and files extra fields under None,
+            # which is what a shard cut off mid-write looks like.
+            if None in row or any(value is None for value in row.values()):
+                raise ValueError(
+                    f"{path}: row {offset} does not have {len(header)} fields (truncated?)"
+                )
+        if len(rows) == 1 and rows[0].get("row_index") == "":
+            sentinel = rows.pop()
+            if any(sentinel.get(col) for col in header if col not in SHARD_COLUMNS):
+                raise ValueError(f"{path}: metadata row without row_index has result values")
+            meta = {key: sentinel.get(key) for key in ("shard", "total_rows", "lookups_hash")}
+            if not all(meta.values()):
+                raise ValueError(f"{path}: empty shard is missing its metadata row")
+        elif not rows:
+            raise ValueError(f"{path}: empty shard is missing its metadata row")
+    missing = [col for col in SHARD_COLUMNS if header is not None and col not in header]
+    if missing:
+        raise ValueError(f"{path}: not a shard output (missing {', '.join(missing)})")
+    for offset, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"{path}: row {offset} is not an object")
+        if fmt == "json" and list(row) != header:
+            raise ValueError(f"{path}: row {offset} has different fields than the first row")
+        blank = [col for col in SHARD_COLUMNS if row.get(col) in (None, "")]
+        if blank:
+            raise ValueError(f"{path}: row {offset} missing {', '.join(blank)}")
+    return header, rows, meta
+
+
+def merge_shards(paths: List[Path], fmt: str) -> Tuple[str, int]:
+    headers = set()
+    hashes = set()
+    totals = set()
+    by_index: Dict[int, dict] = {}
+    for path in paths:
+        header, rows, meta = load_shard_rows(path, fmt)
+        try:
+            if meta is not None:
+                hashes.add(meta["lookups_hash"])
+                totals.add(int(meta["total_rows"]))
+            if header is not None:
+                headers.add(tuple(header))
+            for row in rows:
+                hashes.add(row["lookups_hash"])
+                totals.add(int(row["total_rows"]))
+                index = int(row["row_index"])
+                if index in by_index:
+                    raise ValueError(f"row {index} appears in more than one shard")
+                by_index[index] = row
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"{path}: {exc}") from exc
+    if len(hashes) > 1:
+        raise ValueError("Shards were produced with different lookup tables")
+    if len(totals) > 1:
+        raise ValueError("Shards disagree on the total number of input rows")
+    if len(headers) > 1:
+        raise ValueError("Shards have different output columns")
+    total_rows = totals.pop() if totals else 0
+    missing = [idx for idx in range(total_rows) if idx not in by_index]
+    if missing:
+        preview = ", ".join(str(idx) for idx in missing[:10])
+        raise ValueError(f"{len(missing)} rows missing from shards (first: {preview})")
+    extra = sorted(idx for idx in by_index if not 0 <= idx < total_rows)
+    if extra:
+        raise ValueError(f"Row index {extra[0]} is outside the {total_rows} input rows")
+
+    ordered = [
+        {key: value for key, value in by_index[idx].items() if key not in SHARD_COLUMNS}
+        for idx in range(total_rows)
+    ]
+    if fmt == "json":
+        return json.dumps(ordered, indent=2), total_rows
+    delimiter = "\t" if fmt == "tsv" else ","
+    header = [col for col in headers.pop() if col not in SHARD_COLUMNS] if headers else []
+    lines = [delimiter.join(header)]
+    lines += [delimiter.join(row[col] for col in header) for row in ordered]
+    return "\n".join(lines), total_rows
+
+
+def merge_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="nfl4th merge",
+        description="Combine nfl4th --shard outputs back into original row order",
+    )
+    parser.add_argument("shards", type=Path, nargs="+", help="Shard output files")
+    parser.add_argument(
+        "--format",
+        choices=("csv", "json", "tsv"),
+        default="csv",
+        help="Format the shards were written in (default: csv)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write the merged results to this path instead of stdout",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Allow overwriting existing --output file",
+    )
+    args = parser.parse_args(argv)
+    if args.output and args.output.exists() and not args.force:
+        parser.error(f"{args.output} already exists. Use --force to overwrite.")
+    try:
+        text, total_rows = merge_shards(args.shards, args.format)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Merged {total_rows} rows from {len(args.shards)} shards to {args.output}")
+    else:
+        print(text)
+
+
 def print_single_result(
     out: dict,
     show_wp: bool = False,
@@ -204,12 +648,69 @@ def format_batch_table(results: List[dict], include_wp: bool = False, delimiter:
     return "\n".join(rows)
 
 
+def comparison_header(names: List[str], include_wp: bool = False) -> List[str]:
+    header_parts = ["yard_line", "yards_to_go"]
+    for name in names:
+        header_parts += [
+            f"{name}_recommendation",
+            f"{name}_go_ev",
+            f"{name}_fg_ev",
+            f"{name}_punt_ev",
+        ]
+        if include_wp:
+            header_parts += [f"{name}_go_wp", f"{name}_fg_wp", f"{name}_punt_wp"]
+    header_parts.append("disagreement")
+    return header_parts
+
+
+def format_comparison_row(row: dict, include_wp: bool = False) -> List[str]:
+    cells = [str(row["yard_line"]), str(row["yards_to_go"])]
+    for res in row["variants"].values():
+        cells += [
+            res["recommendation"],
+            f"{res['ev']['go']:.3f}",
+            f"{res['ev']['fg']:.3f}",
+            f"{res['ev']['punt']:.3f}",
+        ]
+        if include_wp:
+            cells += [
+                f"{res['wp']['go']:.3f}",
+                f"{res['wp']['fg']:.3f}",
+                f"{res['wp']['punt']:.3f}",
+            ]
+    cells.append("true" if row["disagreement"] else "false")
+    return cells
+
+
+def format_comparison_table(
+    rows: List[dict], names: List[str], include_wp: bool = False, delimiter: str = ","
+) -> str:
+    lines = [delimiter.join(comparison_header(names, include_wp))]
+    for row in rows:
+        lines.append(delimiter.join(format_comparison_row(row, include_wp=include_wp)))
+    return "\n".join(lines)
+
+
 def print_batch_table(results: List[dict], include_wp: bool = False) -> None:
     print(format_batch_table(results, include_wp=include_wp))
 
 
-def main():
-    parser = argparse.ArgumentParser(description="NFL 4th Down Decision Model")
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "grade":
+        grade_main(argv[1:])
+        return
+    if argv and argv[0] == "merge":
+        merge_main(argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="NFL 4th Down Decision Model",
+        epilog=(
+            "Run 'nfl4th grade --help' to grade actual decisions over a play-by-play file, "
+            "or 'nfl4th merge --help' to combine --shard outputs."
+        ),
+    )
     parser.add_argument(
         "--yard_line",
         type=yard_line_type,
@@ -247,6 +748,12 @@ def main():
         action="store_true",
         help="Allow overwriting existing --output file",
     )
+    parser.add_argument(
+        "--shard",
+        type=shard_type,
+        help="With --input, evaluate only contiguous slice i of N (0-based, e.g. 0/4) and tag "
+        "rows for 'nfl4th merge'",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -255,7 +762,11 @@ def main():
     parser.add_argument(
         "--lookups",
         type=Path,
-        help="Path to alternate lookups.json (defaults to built-in tables)",
+        nargs="+",
+        help=(
+            "Path to alternate lookups.json (defaults to built-in tables). Pass several files "
+            "or a directory of *.json files to compare recommendations across variants."
+        ),
     )
     parser.add_argument(
         "--show-wp",
@@ -277,10 +788,18 @@ def main():
         type=float,
         help="Override expected punt net yards (results capped to field limits)",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
+    lookup_paths: List[Path] = []
     if args.lookups:
-        load_lookups(args.lookups)
+        try:
+            lookup_paths = resolve_lookup_paths(args.lookups)
+            lookup_variant_names(lookup_paths)
+        except ValueError as exc:
+            parser.error(str(exc))
+    compare = len(lookup_paths) > 1
+    if len(lookup_paths) == 1:
+        load_lookups(lookup_paths[0])
     if args.p_convert is not None and not (0 <= args.p_convert <= 1):
         parser.error("--p-convert must be between 0 and 1")
     if args.p_fg is not None and not (0 <= args.p_fg <= 1):
@@ -291,38 +810,75 @@ def main():
     if args.input:
         if args.yard_line is not None or args.yards_to_go is not None:
             parser.error("Provide either --yard_line/--yards_to_go or --input, not both.")
-        cases = load_batch_cases(args.input, args.input_format)
-        results = [
-            evaluate(
-                case["yard_line"],
-                case["yards_to_go"],
-                override_p_convert=choose_override(case["p_convert"], args.p_convert),
-                override_p_fg=choose_override(case["p_fg"], args.p_fg),
-                override_punt_net=choose_override(case["punt_net"], args.punt_net),
+        if args.output and args.output.exists() and not args.force:
+            parser.error(f"{args.output} already exists. Use --force to overwrite.")
+        shard_info: Optional[ShardInfo] = None
+        if args.shard:
+            index, count = args.shard
+            cases, start, total_rows = load_batch_shard(
+                args.input, args.input_format, index, count
             )
-            for case in cases
-        ]
-        if args.output:
-            if args.output.exists() and not args.force:
-                parser.error(f"{args.output} already exists. Use --force to overwrite.")
-            if args.output_format == "json":
-                args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
-            else:
-                delimiter = "\t" if args.output_format == "tsv" else ","
-                args.output.write_text(
-                    format_batch_table(results, include_wp=args.show_wp, delimiter=delimiter),
-                    encoding="utf-8",
+            shard_info = ShardInfo(
+                shard=f"{index}/{count}",
+                start=start,
+                total_rows=total_rows,
+                lookups_hash=variants_lookups_hash(lookup_paths) if compare else lookups_hash(),
+            )
+        else:
+            cases = load_batch_cases(args.input, args.input_format)
+        if compare:
+            by_variant = evaluate_variants(
+                cases, lookup_paths, args.p_convert, args.p_fg, args.punt_net
+            )
+            names = list(by_variant)
+            results = compare_variants(by_variant)
+        else:
+            results = evaluate_cases(cases, args.p_convert, args.p_fg, args.punt_net)
+
+        fmt = args.output_format if args.output else ("json" if args.json else "csv")
+        if fmt == "json":
+            document = shard_json_document(results, shard_info) if shard_info else results
+            text = json.dumps(document, indent=2)
+        else:
+            delimiter = "\t" if fmt == "tsv" else ","
+            if compare:
+                text = format_comparison_table(
+                    results, names, include_wp=args.show_wp, delimiter=delimiter
                 )
+            else:
+                text = format_batch_table(results, include_wp=args.show_wp, delimiter=delimiter)
+            if shard_info:
+                text = add_shard_columns(text, shard_info, delimiter=delimiter)
+        if args.output:
+            args.output.write_text(text, encoding="utf-8")
             print(f"Wrote {len(results)} rows to {args.output}")
-        elif args.json:
-            print(json.dumps(results, indent=2))
         else:
-            print_batch_table(results, include_wp=args.show_wp)
+            print(text)
         return
 
+    if args.shard:
+        parser.error("--shard requires --input")
     if args.yard_line is None or args.yards_to_go is None:
         parser.error("You must specify --yard_line and --yards_to_go for single evaluation.")
 
+    if compare:
+        case = BatchCase(
+            yard_line=args.yard_line,
+            yards_to_go=args.yards_to_go,
+            p_convert=None,
+            p_fg=None,
+            punt_net=None,
+        )
+        by_variant = evaluate_variants(
+            [case], lookup_paths, args.p_convert, args.p_fg, args.punt_net
+        )
+        rows = compare_variants(by_variant)
+        if args.json:
+            print(json.dumps(rows[0], indent=2))
+        else:
+            print(format_comparison_table(rows, list(by_variant), include_wp=args.show_wp))
+        return
+
     out = evaluate(
         args.yard_line,
         args.yards_to_go,
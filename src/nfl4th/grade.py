@@ -0,0 +1,157 @@
+"""Season-level decision grading built on per-play ``evaluate`` results."""
+
+import heapq
+from itertools import count
+from typing import Dict, List, Tuple
+
+DECISIONS = ("go", "fg", "punt")
+
+
+def field_bucket(yard_line: int) -> str:
+    low = ((yard_line - 1) // 10) * 10 + 1
+    return f"{low}-{min(low + 9, 99)}"
+
+
+class GroupStats:
+    __slots__ = ("plays", "agreed", "ev_lost", "wp_lost")
+
+    def __init__(self) -> None:
+        self.plays = 0
+        self.agreed = 0
+        self.ev_lost = 0.0
+        self.wp_lost = 0.0
+
+    def add(self, agreed: bool, ev_lost: float, wp_lost: float) -> None:
+        self.plays += 1
+        self.agreed += int(agreed)
+        self.ev_lost += ev_lost
+        self.wp_lost += wp_lost
+
+    def to_dict(self) -> dict:
+        return {
+            "plays": self.plays,
+            "agreement_rate": self.agreed / self.plays if self.plays else None,
+            "ev_lost": self.ev_lost,
+            "ev_lost_per_play": self.ev_lost / self.plays if self.plays else None,
+            "wp_lost": self.wp_lost,
+            "wp_lost_per_play": self.wp_lost / self.plays if self.plays else None,
+        }
+
+
+class DecisionGrader:
+    """Accumulates EV/WP lost versus the model recommendation one play at a time.
+
+    Memory is bounded by the number of distinct teams, coaches and field buckets
+    plus ``top_n`` retained plays, regardless of how many plays are added.
+    """
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.overall = GroupStats()
+        self.by_team: Dict[str, GroupStats] = {}
+        self.by_coach: Dict[str, GroupStats] = {}
+        self.by_field_position: Dict[str, GroupStats] = {}
+        self._worst: List[Tuple[float, int, dict]] = []
+        self._order = count()
+
+    def add(self, play: dict, result: dict) -> None:
+        decision = play["decision"]
+        recommendation = result["recommendation"]
+        ev_lost = -result["delta_ev"][decision]
+        wp_lost = -result["delta_wp"][decision]
+        agreed = decision == recommendation
+
+        self.overall.add(agreed, ev_lost, wp_lost)
+        groups = [(self.by_field_position, field_bucket(play["yard_line"]))]
+        if play.get("team"):
+            team_key = play["team"]
+            if play.get("season"):
+                team_key = f"{team_key} {play['season']}"
+            groups.append((self.by_team, team_key))
+        if play.get("coach"):
+            groups.append((self.by_coach, play["coach"]))
+        for table, key in groups:
+            stats = table.get(key)
+            if stats is None:
+                stats = table[key] = GroupStats()
+            stats.add(agreed, ev_lost, wp_lost)
+
+        if self.top_n <= 0 or agreed:
+            return
+        # min-heap on EV lost keeps only the top_n worst decisions seen so far
+        entry = (ev_lost, -next(self._order), play)
+        if len(self._worst) < self.top_n:
+            heapq.heappush(self._worst, entry)
+        elif ev_lost > self._worst[0][0]:
+            heapq.heapreplace(self._worst, entry)
+        else:
+            return
+        play["recommendation"] = recommendation
+        play["ev_lost"] = ev_lost
+        play["wp_lost"] = wp_lost
+
+    def report(self) -> dict:
+        def ranked(table: Dict[str, GroupStats]) -> Dict[str, dict]:
+            ordered = sorted(table.items(), key=lambda item: (-item[1].ev_lost, item[0]))
+            return {key: stats.to_dict() for key, stats in ordered}
+
+        buckets = sorted(
+            self.by_field_position.items(), key=lambda item: int(item[0].split("-")[0])
+        )
+        worst = [play for _, _, play in sorted(self._worst, reverse=True)]
+        return {
+            "overall": self.overall.to_dict(),
+            "by_team": ranked(self.by_team),
+            "by_coach": ranked(self.by_coach),
+            "by_field_position": {key: stats.to_dict() for key, stats in buckets},
+            "worst": worst,
+        }
+
+
+def _format_group_table(title: str, label: str, groups: Dict[str, dict]) -> List[str]:
+    lines = [title, "-" * len(title)]
+    lines.append(
+        f"{label:<24}{'plays':>8}{'agree':>8}{'EV lost':>10}{'EV/play':>10}{'WP lost':>10}"
+    )
+    for key, stats in groups.items():
+        lines.append(
+            f"{key:<24}{stats['plays']:>8}{stats['agreement_rate']:>8.1%}"
+            f"{stats['ev_lost']:>10.2f}{stats['ev_lost_per_play']:>10.3f}{stats['wp_lost']:>10.3f}"
+        )
+    lines.append("")
+    return lines
+
+
+def format_grade_report(report: dict) -> str:
+    overall = report["overall"]
+    lines = ["\n4th Down Decision Grades", "------------------------"]
+    lines.append(f"Plays graded: {overall['plays']}")
+    if overall["plays"]:
+        lines.append(f"Agreement with model: {overall['agreement_rate']:.1%}")
+        lines.append(
+            f"EV lost: {overall['ev_lost']:.2f} ({overall['ev_lost_per_play']:.3f} per play)"
+        )
+        lines.append(f"WP lost: {overall['wp_lost']:.3f}")
+    lines.append("")
+    if report["by_team"]:
+        lines += _format_group_table("By team", "team", report["by_team"])
+    if report["by_coach"]:
+        lines += _format_group_table("By coach", "coach", report["by_coach"])
+    if report["by_field_position"]:
+        lines += _format_group_table(
+            "By field position", "yard line", report["by_field_position"]
+        )
+    if report["worst"]:
+        lines += ["Worst decisions", "---------------"]
+        for play in report["worst"]:
+            who = " ".join(
+                str(play[key]) for key in ("team", "season", "week", "coach") if play.get(key)
+            )
+            lines.append(
+                f"row {play['row']:>6}  {who:<28} {play['yard_line']:>2} yd, "
+                f"{play['yards_to_go']:g} to go: {play['decision'].upper()} "
+                f"(model {play['recommendation'].upper()})  "
+                f"EV lost {play['ev_lost']:.3f}  WP lost {play['wp_lost']:.3f}"
+            )
+        lines.append("")
+    return "\n".join(lines)
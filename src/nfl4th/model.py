@@ -1,9 +1,15 @@
+import hashlib
 import json
+from bisect import bisect_left
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 
 def _interp(value: float, samples: Iterable[Tuple[float, float]]) -> float:
+    if isinstance(samples, SharedCurve):
+        return samples.interp(value)
     ordered = sorted(samples, key=lambda item: item[0])
     if value <= ordered[0][0]:
         return ordered[0][1]
@@ -21,29 +27,192 @@ def _interp(value: float, samples: Iterable[Tuple[float, float]]) -> float:
 
 LOOKUPS_PATH = Path(__file__).resolve().with_name("lookups.json")
 
-CONVERT_PROB_POINTS: List[Tuple[float, float]] = []
-FG_PROB_POINTS: List[Tuple[float, float]] = []
-EP_POINTS: List[Tuple[float, float]] = []
-PUNT_NET_POINTS: List[Tuple[float, float]] = []
-WP_POINTS: List[Tuple[float, float]] = []
+CURVE_NAMES = ("convert", "fg", "ep", "punt_net", "wp")
+
+CONVERT_PROB_POINTS: Sequence[Tuple[float, float]] = []
+FG_PROB_POINTS: Sequence[Tuple[float, float]] = []
+EP_POINTS: Sequence[Tuple[float, float]] = []
+PUNT_NET_POINTS: Sequence[Tuple[float, float]] = []
+WP_POINTS: Sequence[Tuple[float, float]] = []
+
+_SHARED_BLOCK: Optional[shared_memory.SharedMemory] = None
+_LOADED = False
+
+
+class SharedCurve(Sequence):
+    """Read-only (x, y) points backed by slices of a shared-memory block.
+
+    ``publish_lookups`` stores every curve already sorted by x, with the x values
+    and y values in two contiguous runs, so ``interp`` can bisect the shared
+    buffer directly instead of sorting and copying the points on every call.
+    """
+
+    def __init__(self, xs: memoryview, ys: memoryview):
+        self._xs = xs
+        self._ys = ys
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("curve index out of range")
+        return (self._xs[idx], self._ys[idx])
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return zip(self._xs, self._ys)
+
+    def interp(self, value: float) -> float:
+        xs, ys = self._xs, self._ys
+        if value <= xs[0]:
+            return ys[0]
+        if value >= xs[-1]:
+            return ys[-1]
+        idx = bisect_left(xs, value)
+        x0, x1 = xs[idx - 1], xs[idx]
+        span = x1 - x0
+        weight = (value - x0) / span if span else 0.0
+        return ys[idx - 1] + weight * (ys[idx] - ys[idx - 1])
+
+    def release(self) -> None:
+        self._xs.release()
+        self._ys.release()
+
+
+def _active_curves() -> List[Sequence[Tuple[float, float]]]:
+    return [CONVERT_PROB_POINTS, FG_PROB_POINTS, EP_POINTS, PUNT_NET_POINTS, WP_POINTS]
+
+
+def _set_curves(curves: List[Sequence[Tuple[float, float]]]) -> None:
+    global CONVERT_PROB_POINTS, FG_PROB_POINTS, EP_POINTS, PUNT_NET_POINTS, WP_POINTS, _LOADED
+    _release_shared()
+    CONVERT_PROB_POINTS, FG_PROB_POINTS, EP_POINTS, PUNT_NET_POINTS, WP_POINTS = curves
+    _LOADED = True
+
+
+def _ensure_lookups() -> None:
+    # The built-in tables load on first use rather than at import, so a worker that
+    # only calls attach_lookups never parses lookups.json.
+    if not _LOADED:
+        load_lookups()
+
+
+def _release_shared() -> None:
+    global _SHARED_BLOCK
+    if _SHARED_BLOCK is None:
+        return
+    for curve in _active_curves():
+        if isinstance(curve, SharedCurve):
+            curve.release()
+    _SHARED_BLOCK.close()
+    _SHARED_BLOCK = None
 
 
 def load_lookups(path: Optional[Path] = None) -> None:
     target = Path(path) if path else LOOKUPS_PATH
     with target.open() as fh:
         data: Dict[str, List[List[float]]] = json.load(fh)
-    global CONVERT_PROB_POINTS, FG_PROB_POINTS, EP_POINTS, PUNT_NET_POINTS, WP_POINTS
-    CONVERT_PROB_POINTS = [tuple(pair) for pair in data["convert"]]
-    FG_PROB_POINTS = [tuple(pair) for pair in data["fg"]]
-    EP_POINTS = [tuple(pair) for pair in data["ep"]]
-    PUNT_NET_POINTS = [tuple(pair) for pair in data["punt_net"]]
-    WP_POINTS = [tuple(pair) for pair in data["wp"]]
+    _set_curves([[tuple(pair) for pair in data[name]] for name in CURVE_NAMES])
+
+
+@contextmanager
+def use_lookups(path: Path) -> Iterator[None]:
+    """Temporarily activate the tables in ``path``, then restore the previous curves.
+
+    Whatever was active before, including curves attached with ``attach_lookups``,
+    comes back unchanged; an attached block stays open while the override is active.
+    """
+    global _SHARED_BLOCK
+    _ensure_lookups()
+    saved_curves, saved_block = _active_curves(), _SHARED_BLOCK
+    _SHARED_BLOCK = None
+    try:
+        load_lookups(path)
+        yield
+    finally:
+        _set_curves(saved_curves)
+        _SHARED_BLOCK = saved_block
+
+
+def lookups_hash() -> str:
+    """Stable digest of the active lookup curves, however they were loaded.
+
+    Points are hashed in x order (as ``publish_lookups`` stores them), so a file
+    and its attached shared-memory copy digest the same.
+    """
+    _ensure_lookups()
+    payload = [
+        [[float(x), float(y)] for x, y in sorted(curve, key=lambda item: item[0])]
+        for curve in _active_curves()
+    ]
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
+
+
+def publish_lookups(name: Optional[str] = None) -> shared_memory.SharedMemory:
+    """Copy the active lookup curves into a shared-memory block.
+
+    Layout is a flat array of doubles: one point count per curve, then for each
+    curve in ``CURVE_NAMES`` order its x values followed by its y values, sorted
+    by x. Pre-sorting costs nothing at attach time and lets workers interpolate
+    straight from the buffer; the price is that the block is a frozen snapshot,
+    so republish after ``load_lookups`` if the tables change. The caller owns the
+    block and should ``close()`` and ``unlink()`` it once workers are done.
+    """
+    _ensure_lookups()
+    curves = [sorted(curve, key=lambda item: item[0]) for curve in _active_curves()]
+    values = [float(len(curve)) for curve in curves]
+    for curve in curves:
+        values += [float(x) for x, _ in curve]
+        values += [float(y) for _, y in curve]
+    block = shared_memory.SharedMemory(name=name, create=True, size=len(values) * 8)
+    view = block.buf.cast("d")
+    for idx, value in enumerate(values):
+        view[idx] = value
+    view.release()
+    return block
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Python < 3.13 registers every attach with the resource tracker, which would
+    # unlink the publisher's block when a worker exits. Skip that registration.
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
 
 
-load_lookups()
+def attach_lookups(name: str) -> None:
+    """Use lookup curves published by ``publish_lookups`` without copying them."""
+    global _SHARED_BLOCK
+    block = _attach_block(name)
+    readonly = block.buf.toreadonly()
+    view = readonly.cast("d")
+    counts = [int(view[idx]) for idx in range(len(CURVE_NAMES))]
+    curves: List[Sequence[Tuple[float, float]]] = []
+    offset = len(CURVE_NAMES)
+    for count in counts:
+        xs = view[offset : offset + count]
+        ys = view[offset + count : offset + 2 * count]
+        curves.append(SharedCurve(xs, ys))
+        offset += 2 * count
+    view.release()
+    readonly.release()
+    _set_curves(curves)
+    _SHARED_BLOCK = block
 
 
 def p_convert(yards_to_go: float) -> float:
+    _ensure_lookups()
     p = _interp(yards_to_go, CONVERT_PROB_POINTS)
     return max(0.05, min(0.95, p))
 
@@ -53,11 +222,13 @@ def fg_distance(yard_line: int) -> int:
 
 
 def p_fg_make(distance: int) -> float:
+    _ensure_lookups()
     p = _interp(distance, FG_PROB_POINTS)
     return max(0.02, min(0.98, p))
 
 
 def ep_by_yardline(yard_line: int) -> float:
+    _ensure_lookups()
     yard = max(1, min(99, yard_line))
     return _interp(yard, EP_POINTS)
 
@@ -65,6 +236,7 @@ def flip_field(yard_line: int) -> int:
     return 100 - yard_line
 
 def expected_punt_spot(yard_line: int) -> int:
+    _ensure_lookups()
     net = _interp(yard_line, PUNT_NET_POINTS)
     new_spot = yard_line + net
     if new_spot >= 100:
@@ -74,6 +246,7 @@ def expected_punt_spot(yard_line: int) -> int:
 
 
 def win_prob_from_ep(ep: float) -> float:
+    _ensure_lookups()
     return _interp(ep, WP_POINTS)
 
 def evaluate(
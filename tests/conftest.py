@@ -1,7 +1,24 @@
+import json
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture
+def no_kicker_lookups(tmp_path: Path) -> Path:
+    """Built-in tables with field goals made 2% of the time, written to lookups/no_kicker.json."""
+    from nfl4th import model
+
+    tables = json.loads(model.LOOKUPS_PATH.read_text(encoding="utf-8"))
+    tables["fg"] = [[20, 0.02], [65, 0.02]]
+    lookup_dir = tmp_path / "lookups"
+    lookup_dir.mkdir()
+    path = lookup_dir / "no_kicker.json"
+    path.write_text(json.dumps(tables), encoding="utf-8")
+    return path
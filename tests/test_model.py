@@ -1,10 +1,26 @@
+import argparse
 import json
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 
 from nfl4th import model
-from nfl4th.cli import format_batch_table, load_batch_cases
+from nfl4th.cli import (
+    compare_variants,
+    evaluate_variants,
+    format_batch_table,
+    format_comparison_table,
+    grade_plays,
+    iter_graded_plays,
+    load_batch_cases,
+    load_batch_shard,
+    main,
+    merge_shards,
+    resolve_lookup_paths,
+    variants_lookups_hash,
+)
 
 
 def test_p_convert_bounds_and_monotonic():
@@ -64,6 +80,90 @@ def test_load_custom_lookup(tmp_path: Path):
         model.load_lookups()  # reset back to default tables for other tests
 
 
+def test_attach_published_lookups_without_copy():
+    baseline = model.evaluate(75, 1)
+    block = model.publish_lookups()
+    try:
+        model.load_lookups()
+        model.attach_lookups(block.name)
+        assert isinstance(model.EP_POINTS, model.SharedCurve)
+        assert list(model.FG_PROB_POINTS)[0] == pytest.approx((20.0, 0.98))
+        assert model.evaluate(75, 1) == baseline
+        with pytest.raises(TypeError):
+            model.EP_POINTS._xs[0] = 0.0  # workers attach read-only
+    finally:
+        model.load_lookups()
+        block.close()
+        block.unlink()
+
+
+def test_attach_in_fresh_process_skips_lookup_file():
+    block = model.publish_lookups()
+    script = (
+        "import pathlib, sys\n"
+        "real_open = pathlib.Path.open\n"
+        "def guarded_open(self, *args, **kwargs):\n"
+        "    assert self.name != 'lookups.json', 'lookups.json parsed'\n"
+        "    return real_open(self, *args, **kwargs)\n"
+        "pathlib.Path.open = guarded_open\n"
+        "from nfl4th import model\n"
+        "model.attach_lookups(sys.argv[1])\n"
+        "print(model.evaluate(75, 1)['recommendation'])\n"
+    )
+    try:
+        out = subprocess.run(
+            [sys.executable, "-c", script, block.name],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={"PYTHONPATH": str(Path(model.__file__).parents[1])},
+        )
+    finally:
+        block.close()
+        block.unlink()
+    assert out.stdout.strip() == model.evaluate(75, 1)["recommendation"]
+
+
+def test_attached_lookups_match_unsorted_source_curves(tmp_path: Path):
+    shuffled = json.loads(model.LOOKUPS_PATH.read_text(encoding="utf-8"))
+    for name in model.CURVE_NAMES:
+        shuffled[name] = shuffled[name][::-1]
+    lookup_path = tmp_path / "shuffled.json"
+    lookup_path.write_text(json.dumps(shuffled), encoding="utf-8")
+    situations = [(yl, ytg) for yl in range(1, 100, 7) for ytg in (0.5, 1, 3.5, 9, 20)]
+    model.load_lookups(lookup_path)
+    expected = [model.evaluate(yl, ytg) for yl, ytg in situations]
+    expected_hash = model.lookups_hash()
+    block = model.publish_lookups()
+    try:
+        model.attach_lookups(block.name)
+        assert [model.evaluate(yl, ytg) for yl, ytg in situations] == expected
+        assert model.lookups_hash() == expected_hash
+    finally:
+        model.load_lookups()
+        block.close()
+        block.unlink()
+
+
+def test_variant_comparison_keeps_attached_lookups(no_kicker_lookups: Path):
+    model.load_lookups(no_kicker_lookups)
+    block = model.publish_lookups()
+    try:
+        model.attach_lookups(block.name)
+        attached = model.FG_PROB_POINTS
+        cases = load_batch_cases(Path(__file__).parents[1] / "examples/sample_plays.csv", "csv")
+        before = model.lookups_hash()
+        evaluate_variants(cases, [model.LOOKUPS_PATH])
+        variants_lookups_hash([model.LOOKUPS_PATH, no_kicker_lookups])
+        assert model.FG_PROB_POINTS is attached
+        assert model.lookups_hash() == before
+        assert model.evaluate(75, 1)["recommendation"] == "go"  # still the shared tables
+    finally:
+        model.load_lookups()
+        block.close()
+        block.unlink()
+
+
 @pytest.mark.parametrize(
     "yard_line,yards_to_go,expected",
     [
@@ -157,3 +257,206 @@ def test_load_batch_cases_with_overrides_json(tmp_path: Path):
     assert rows[0]["p_convert"] == 0.5
     assert rows[0]["p_fg"] == 0.8
     assert rows[0]["punt_net"] == 42
+
+
+def test_evaluate_variants_flags_disagreement(tmp_path: Path, no_kicker_lookups: Path):
+    lookup_dir = no_kicker_lookups.parent
+    (lookup_dir / "base.json").write_text(model.LOOKUPS_PATH.read_text(encoding="utf-8"))
+    paths = resolve_lookup_paths([lookup_dir])
+    csv_path = tmp_path / "plays.csv"
+    csv_path.write_text("yard_line,yards_to_go\n75,1\n20,1\n", encoding="utf-8")
+    cases = load_batch_cases(csv_path, "csv")
+    by_variant = evaluate_variants(cases, paths)
+    assert list(by_variant) == ["base", "no_kicker"]
+    rows = compare_variants(by_variant)
+    assert len(rows) == len(cases)
+    assert rows[0]["variants"]["base"]["recommendation"] == "fg"
+    assert rows[0]["variants"]["no_kicker"]["recommendation"] == "go"
+    assert rows[0]["disagreement"] is True
+    assert rows[1]["disagreement"] is False
+    # default tables are restored once the comparison finishes
+    assert model.evaluate(75, 1)["recommendation"] == "fg"
+
+    table = format_comparison_table(rows, list(by_variant)).splitlines()
+    assert table[0] == (
+        "yard_line,yards_to_go,base_recommendation,base_go_ev,base_fg_ev,base_punt_ev,"
+        "no_kicker_recommendation,no_kicker_go_ev,no_kicker_fg_ev,no_kicker_punt_ev,disagreement"
+    )
+    assert table[1].endswith(",true")
+    assert table[2].endswith(",false")
+
+
+def test_grade_plays_aggregates_ev_lost(tmp_path: Path):
+    pbp = tmp_path / "pbp.csv"
+    pbp.write_text(
+        "team,coach,season,week,yard_line,yards_to_go,decision\n"
+        "KC,Reid,2023,1,75,1,go\n"
+        "KC,Reid,2023,2,40,2,punt\n"
+        "BUF,McDermott,2023,3,20,1,GO\n",
+        encoding="utf-8",
+    )
+    report = grade_plays(iter_graded_plays(pbp), top_n=1)
+    assert report["overall"]["plays"] == 3
+    assert report["overall"]["agreement_rate"] == pytest.approx(1 / 3)
+    kc = report["by_team"]["KC 2023"]
+    go_75 = model.evaluate(75, 1)
+    assert kc["ev_lost"] == pytest.approx(-go_75["delta_ev"]["go"])
+    assert kc["wp_lost"] == pytest.approx(-go_75["delta_wp"]["go"])
+    assert list(report["by_team"]) == ["BUF 2023", "KC 2023"]  # worst first
+    assert set(report["by_coach"]) == {"Reid", "McDermott"}
+    assert set(report["by_field_position"]) == {"11-20", "31-40", "71-80"}
+    assert len(report["worst"]) == 1
+    assert report["worst"][0]["team"] == "BUF"
+    assert report["worst"][0]["recommendation"] == "punt"
+
+
+def test_iter_graded_plays_rejects_unknown_decision(tmp_path: Path):
+    pbp = tmp_path / "pbp.csv"
+    pbp.write_text("yard_line,yards_to_go,decision\n50,1,kneel\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_graded_plays(pbp))
+
+
+@pytest.mark.parametrize("fmt", ["csv", "json"])
+def test_shards_merge_back_to_unsharded_output(tmp_path: Path, fmt: str, capsys):
+    plays = tmp_path / "plays.csv"
+    plays.write_text(
+        "yard_line,yards_to_go\n" + "".join(f"{yl},{yl % 9 + 1}\n" for yl in range(5, 96, 7)),
+        encoding="utf-8",
+    )
+    full = tmp_path / f"full.{fmt}"
+    main(["--input", str(plays), "--output", str(full), "--output-format", fmt])
+    shards = []
+    for idx in (2, 0, 1):
+        shard = tmp_path / f"shard{idx}.{fmt}"
+        main(["--input", str(plays), "--shard", f"{idx}/3", "--output", str(shard),
+              "--output-format", fmt])
+        shards.append(shard)
+    capsys.readouterr()
+
+    merged, total = merge_shards(shards, fmt)
+    assert total == 13
+    assert merged == full.read_text(encoding="utf-8")
+    with pytest.raises(ValueError, match="missing"):
+        merge_shards(shards[:2], fmt)
+    with pytest.raises(ValueError, match="more than one shard"):
+        merge_shards(shards + shards[:1], fmt)
+
+
+def test_merge_rejects_mixed_lookup_tables(tmp_path: Path, no_kicker_lookups: Path, capsys):
+    plays = tmp_path / "plays.csv"
+    plays.write_text("yard_line,yards_to_go\n40,2\n75,1\n", encoding="utf-8")
+    first, second = tmp_path / "s0.csv", tmp_path / "s1.csv"
+    try:
+        main(["--input", str(plays), "--shard", "0/2", "--output", str(first)])
+        main(["--input", str(plays), "--shard", "1/2", "--output", str(second),
+              "--lookups", str(no_kicker_lookups)])
+    finally:
+        model.load_lookups()
+    capsys.readouterr()
+    with pytest.raises(ValueError, match="different lookup tables"):
+        merge_shards([first, second], "csv")
+
+
+@pytest.mark.parametrize("fmt", ["csv", "json"])
+def test_load_batch_shard_parses_only_its_rows(tmp_path: Path, fmt: str):
+    plays = [{"yard_line": yl, "yards_to_go": 2} for yl in (10, 20, 30, 40)]
+    plays.append({"yard_line": "bad", "yards_to_go": 2})  # only shard 1/2 sees this row
+    path = tmp_path / f"plays.{fmt}"
+    if fmt == "csv":
+        body = "".join(f"{p['yard_line']},{p['yards_to_go']}\n" for p in plays)
+        path.write_text("yard_line,yards_to_go\n" + body, encoding="utf-8")
+    else:
+        path.write_text(json.dumps(plays), encoding="utf-8")
+    cases, start, total = load_batch_shard(path, fmt, 0, 2)
+    assert (start, total) == (0, 5)
+    assert [case["yard_line"] for case in cases] == [10, 20]
+    with pytest.raises(argparse.ArgumentTypeError, match="yard line must be an integer"):
+        load_batch_shard(path, fmt, 1, 2)
+
+
+def test_merge_validates_every_json_row(tmp_path: Path, capsys):
+    plays = tmp_path / "plays.csv"
+    plays.write_text("yard_line,yards_to_go\n40,2\n75,1\n60,3\n", encoding="utf-8")
+    shards = [tmp_path / f"s{idx}.json" for idx in range(4)]
+    for idx, shard in enumerate(shards):
+        main(["--input", str(plays), "--shard", f"{idx}/4", "--output", str(shard),
+              "--output-format", "json"])
+    capsys.readouterr()
+    empty = json.loads(shards[0].read_text(encoding="utf-8"))
+    assert empty["rows"] == []  # 3 rows over 4 shards leaves the first one empty
+    merged, total = merge_shards(shards, "json")
+    assert total == 3 and len(json.loads(merged)) == 3
+
+    empty["lookups_hash"] = "0" * 64
+    shards[0].write_text(json.dumps(empty), encoding="utf-8")
+    with pytest.raises(ValueError, match="different lookup tables"):
+        merge_shards(shards, "json")
+
+    broken = json.loads(shards[3].read_text(encoding="utf-8"))
+    broken["rows"][0].pop("row_index")
+    shards[3].write_text(json.dumps(broken), encoding="utf-8")
+    with pytest.raises(ValueError, match="s3.json"):
+        merge_shards(shards[1:], "json")
+
+
+def test_shards_of_csv_with_blank_lines_merge(tmp_path: Path, capsys):
+    plays = tmp_path / "plays.csv"
+    plays.write_text("yard_line,yards_to_go\n40,2\n75,1\n\n60,3\n20,4\n", encoding="utf-8")
+    full = tmp_path / "full.csv"
+    main(["--input", str(plays), "--output", str(full)])
+    shards = [tmp_path / f"s{idx}.csv" for idx in range(2)]
+    for idx, shard in enumerate(shards):
+        main(["--input", str(plays), "--shard", f"{idx}/2", "--output", str(shard)])
+    capsys.readouterr()
+    merged, total = merge_shards(shards, "csv")
+    assert total == 4
+    assert merged == full.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("fmt", ["csv", "tsv"])
+def test_empty_table_shards_keep_metadata(
+    tmp_path: Path, fmt: str, no_kicker_lookups: Path, capsys
+):
+    plays = tmp_path / "plays.csv"
+    plays.write_text("yard_line,yards_to_go\n40,2\n75,1\n", encoding="utf-8")
+    shards = [tmp_path / f"s{idx}.{fmt}" for idx in range(3)]
+    try:
+        main(["--input", str(plays), "--shard", "0/3", "--output", str(shards[0]),
+              "--output-format", fmt, "--lookups", str(no_kicker_lookups)])
+    finally:
+        model.load_lookups()
+    for idx in (1, 2):
+        main(["--input", str(plays), "--shard", f"{idx}/3", "--output", str(shards[idx]),
+              "--output-format", fmt])
+    capsys.readouterr()
+    with pytest.raises(ValueError, match="different lookup tables"):
+        merge_shards(shards, fmt)
+
+    empty = tmp_path / "empty.csv"
+    empty.write_text("yard_line,yards_to_go\n", encoding="utf-8")
+    full = tmp_path / f"full.{fmt}"
+    main(["--input", str(empty), "--output", str(full), "--output-format", fmt])
+    for idx, shard in enumerate(shards[:2]):
+        main(["--input", str(empty), "--shard", f"{idx}/2", "--output", str(shard),
+              "--output-format", fmt, "--force"])
+    capsys.readouterr()
+    merged, total = merge_shards(shards[:2], fmt)
+    assert total == 0
+    assert merged == full.read_text(encoding="utf-8")
+
+
+def test_merge_rejects_truncated_csv_shard(tmp_path: Path, capsys):
+    plays = tmp_path / "plays.csv"
+    plays.write_text("yard_line,yards_to_go\n40,2\n75,1\n60,3\n", encoding="utf-8")
+    shards = [tmp_path / f"s{idx}.csv" for idx in range(2)]
+    for idx, shard in enumerate(shards):
+        main(["--input", str(plays), "--shard", f"{idx}/2", "--output", str(shard)])
+    capsys.readouterr()
+    text = shards[1].read_text(encoding="utf-8")
+    shards[1].write_text(text[: text.rindex(",")], encoding="utf-8")  # killed mid-write
+    with pytest.raises(ValueError, match="s1.csv: row 1 does not have"):
+        merge_shards(shards, "csv")
+    shards[1].write_text(text + ",extra", encoding="utf-8")
+    with pytest.raises(ValueError, match="s1.csv: row 1 does not have"):
+        merge_shards(shards, "csv")